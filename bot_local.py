@@ -13,22 +13,33 @@ Usage:
     uv run bot-local.py
     # or with custom host/port
     uv run bot-local.py --host 0.0.0.0 --port 8080
+    # or configure through the environment
+    HOST=0.0.0.0 PORT=8080 uv run bot-local.py
 """
 
 import argparse
 import asyncio
+import copy
+import gzip
+import hashlib
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from typing import NamedTuple, Optional
 
+import numpy as np
+import orjson
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import BackgroundTasks, FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
 from google import genai
 from google.genai import types
 from loguru import logger
 from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADParams
 from pipecat.frames.frames import LLMRunFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
@@ -36,7 +47,7 @@ from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
 from pipecat.services.google.gemini_live.llm import GeminiLiveLLMService
 from pipecat.transports.base_transport import TransportParams
-from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
+from pipecat.transports.smallwebrtc.connection import IceServer, SmallWebRTCConnection
 from pipecat.transports.smallwebrtc.transport import SmallWebRTCTransport
 
 load_dotenv(override=True)
@@ -58,158 +69,332 @@ GOOGLE_SEARCH_TOOL = [
     types.Tool(google_search=types.GoogleSearch()),
 ]
 
-# HTML UI for the bot
-HTML_UI = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Pipecat Voice Bot - Local Demo</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            padding: 20px;
-        }
-
-        .container {
-            background: white;
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-            max-width: 500px;
-            width: 100%;
-        }
-
-        h1 {
-            color: #333;
-            margin-bottom: 10px;
-            font-size: 28px;
-            text-align: center;
-        }
-
-        .subtitle {
-            color: #666;
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 14px;
-        }
-
-        .status {
-            padding: 15px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            font-weight: 500;
-            text-align: center;
-            transition: all 0.3s ease;
-        }
-
-        .status.disconnected {
-            background: #fee;
-            color: #c33;
-        }
-
-        .status.connecting {
-            background: #ffeaa7;
-            color: #d63031;
-        }
-
-        .status.connected {
-            background: #d4edda;
-            color: #155724;
-        }
-
-        button {
-            width: 100%;
-            padding: 15px;
-            border: none;
-            border-radius: 10px;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
+# Gemini Live settings, resolved once and shared by every call
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+GEMINI_MODEL = "models/gemini-2.5-flash-native-audio-preview-09-2025"
+GEMINI_VOICE_ID = "Enceladus"  # Aoede, Charon, Fenrir, Kore, Puck
+
+# ICE server URLs shared by every WebRTC connection; STUN_URL takes precedence when set
+ICE_SERVER_URLS = tuple(
+    url
+    for url in (
+        os.getenv("STUN_URL"),
+        "stun:stun.l.google.com:19302",
+        "stun:stun1.l.google.com:19302",
+    )
+    if url
+)
 
-        button:disabled {
-            opacity: 0.5;
-            cursor: not-allowed;
-        }
+# Parsed once so connections don't rebuild them from the URL strings on every offer
+ICE_SERVERS = [IceServer(urls=url) for url in ICE_SERVER_URLS]
 
-        #connectBtn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
+# Silero VAD tuning. A higher start time filters short noises that Silero tends to
+# misread as speech in Hindi, avoiding spurious Gemini turns.
+VAD_PARAMS = VADParams(
+    confidence=float(os.getenv("VAD_CONFIDENCE", "0.7")),
+    start_secs=float(os.getenv("VAD_START_SECS", "0.4")),
+    stop_secs=float(os.getenv("VAD_STOP_SECS", "0.8")),
+    min_volume=float(os.getenv("VAD_MIN_VOLUME", "0.6")),
+)
 
-        #connectBtn:hover:not(:disabled) {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 20px rgba(102, 126, 234, 0.3);
-        }
+# Silero VAD analyzer loaded once per process; per-call analyzers share its ONNX session
+_vad_template: Optional[SileroVADAnalyzer] = None
+
+# Pipeline runner shared by all calls; created inside the serving event loop
+_pipeline_runner: Optional[PipelineRunner] = None
+
+# Plain, uncolored log lines; backtrace/diagnose are off to keep exception logging cheap
+LOG_FORMAT = "{time:HH:mm:ss.SSS} {level} {message}"
+
+# Per-frame pipeline metrics are costly on the audio path; opt in with PIPECAT_METRICS=1
+ENABLE_METRICS = os.getenv("PIPECAT_METRICS", "0") == "1"
+
+# Bounded hand-off between the HTTP endpoints and the bot workers
+MAX_CONCURRENT_CALLS = int(os.getenv("MAX_CONCURRENT_CALLS", "8"))
+
+_bot_queue: Optional[asyncio.Queue] = None
+_bot_workers: list[asyncio.Task] = []
+# Calls admitted to a worker and not yet finished; never exceeds MAX_CONCURRENT_CALLS
+_reserved_bot_slots = 0
+_stopping_bot_workers = False
+
+# Stylesheet for the bot UI, served from /static/app.css
+UI_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    padding: 20px;
+}
+
+.container {
+    background: white;
+    border-radius: 20px;
+    padding: 40px;
+    box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
+    max-width: 500px;
+    width: 100%;
+}
+
+h1 {
+    color: #333;
+    margin-bottom: 10px;
+    font-size: 28px;
+    text-align: center;
+}
+
+.subtitle {
+    color: #666;
+    text-align: center;
+    margin-bottom: 30px;
+    font-size: 14px;
+}
+
+.status {
+    padding: 15px;
+    border-radius: 10px;
+    margin-bottom: 20px;
+    font-weight: 500;
+    text-align: center;
+    transition: all 0.3s ease;
+}
+
+.status.disconnected {
+    background: #fee;
+    color: #c33;
+}
+
+.status.connecting {
+    background: #ffeaa7;
+    color: #d63031;
+}
+
+.status.connected {
+    background: #d4edda;
+    color: #155724;
+}
+
+button {
+    width: 100%;
+    padding: 15px;
+    border: none;
+    border-radius: 10px;
+    font-size: 16px;
+    font-weight: 600;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+button:disabled {
+    opacity: 0.5;
+    cursor: not-allowed;
+}
+
+#connectBtn {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+}
+
+#connectBtn:hover:not(:disabled) {
+    transform: translateY(-2px);
+    box-shadow: 0 10px 20px rgba(102, 126, 234, 0.3);
+}
+
+#disconnectBtn {
+    background: #dc3545;
+    color: white;
+    margin-top: 10px;
+}
+
+#disconnectBtn:hover:not(:disabled) {
+    background: #c82333;
+    transform: translateY(-2px);
+    box-shadow: 0 10px 20px rgba(220, 53, 69, 0.3);
+}
+
+.info {
+    margin-top: 30px;
+    padding: 20px;
+    background: #f8f9fa;
+    border-radius: 10px;
+    font-size: 14px;
+    color: #666;
+}
+
+.info h3 {
+    color: #333;
+    margin-bottom: 10px;
+    font-size: 16px;
+}
+
+.info ul {
+    margin-left: 20px;
+    margin-top: 10px;
+}
+
+.info li {
+    margin: 5px 0;
+}
+
+.spinner {
+    display: inline-block;
+    width: 14px;
+    height: 14px;
+    border: 2px solid #f3f3f3;
+    border-top: 2px solid #d63031;
+    border-radius: 50%;
+    animation: spin 1s linear infinite;
+    margin-right: 8px;
+}
+
+@keyframes spin {
+    0% { transform: rotate(0deg); }
+    100% { transform: rotate(360deg); }
+}
+"""
 
-        #disconnectBtn {
-            background: #dc3545;
-            color: white;
-            margin-top: 10px;
-        }
+# Client-side WebRTC logic for the bot UI, served from /static/app.js
+UI_JS = """
+let peerConnection = null;
+let localStream = null;
+let remoteStream = null;
+
+const connectBtn = document.getElementById('connectBtn');
+const disconnectBtn = document.getElementById('disconnectBtn');
+const statusDiv = document.getElementById('status');
+const remoteAudio = document.getElementById('remoteAudio');
+
+function updateStatus(status, message) {
+    statusDiv.className = `status ${status}`;
+    statusDiv.innerHTML = message;
+}
+
+connectBtn.addEventListener('click', async () => {
+    try {
+        connectBtn.disabled = true;
+        updateStatus('connecting', '<span class="spinner"></span>Connecting...');
+
+        // Get user media
+        localStream = await navigator.mediaDevices.getUserMedia({
+            audio: true,
+            video: false
+        });
 
-        #disconnectBtn:hover:not(:disabled) {
-            background: #c82333;
-            transform: translateY(-2px);
-            box-shadow: 0 10px 20px rgba(220, 53, 69, 0.3);
-        }
+        // Create peer connection
+        peerConnection = new RTCPeerConnection({
+            iceServers: [
+                { urls: 'stun:stun.l.google.com:19302' },
+                { urls: 'stun:stun1.l.google.com:19302' }
+            ],
+            iceTransportPolicy: 'all',
+            bundlePolicy: 'max-bundle',
+            rtcpMuxPolicy: 'require'
+        });
 
-        .info {
-            margin-top: 30px;
-            padding: 20px;
-            background: #f8f9fa;
-            border-radius: 10px;
-            font-size: 14px;
-            color: #666;
-        }
+        // Add local tracks
+        localStream.getTracks().forEach(track => {
+            peerConnection.addTrack(track, localStream);
+        });
 
-        .info h3 {
-            color: #333;
-            margin-bottom: 10px;
-            font-size: 16px;
-        }
+        // Handle remote tracks
+        remoteStream = new MediaStream();
+        peerConnection.ontrack = (event) => {
+            event.streams[0].getTracks().forEach(track => {
+                remoteStream.addTrack(track);
+            });
+            remoteAudio.srcObject = remoteStream;
+        };
+
+        // Handle connection state changes
+        peerConnection.onconnectionstatechange = () => {
+            console.log('Connection state:', peerConnection.connectionState);
+            if (peerConnection.connectionState === 'connected') {
+                updateStatus('connected', '✓ Connected - Start speaking!');
+                connectBtn.style.display = 'none';
+                disconnectBtn.style.display = 'block';
+            } else if (peerConnection.connectionState === 'disconnected' ||
+                       peerConnection.connectionState === 'failed') {
+                disconnect();
+            }
+        };
 
-        .info ul {
-            margin-left: 20px;
-            margin-top: 10px;
-        }
+        // Create offer
+        const offer = await peerConnection.createOffer({
+            offerToReceiveAudio: true,
+            offerToReceiveVideo: false
+        });
+        await peerConnection.setLocalDescription(offer);
+
+        // Send offer to server
+        const response = await fetch('/api/offer', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                sdp: offer.sdp,
+                type: offer.type
+            })
+        });
 
-        .info li {
-            margin: 5px 0;
+        if (!response.ok) {
+            throw new Error('Failed to connect to server');
         }
 
-        .spinner {
-            display: inline-block;
-            width: 14px;
-            height: 14px;
-            border: 2px solid #f3f3f3;
-            border-top: 2px solid #d63031;
-            border-radius: 50%;
-            animation: spin 1s linear infinite;
-            margin-right: 8px;
-        }
+        const answer = await response.json();
+        await peerConnection.setRemoteDescription(new RTCSessionDescription(answer));
+
+    } catch (error) {
+        console.error('Connection error:', error);
+        updateStatus('disconnected', '✗ Connection failed: ' + error.message);
+        disconnect();
+    }
+});
+
+disconnectBtn.addEventListener('click', disconnect);
+
+function disconnect() {
+    if (peerConnection) {
+        peerConnection.close();
+        peerConnection = null;
+    }
+
+    if (localStream) {
+        localStream.getTracks().forEach(track => track.stop());
+        localStream = null;
+    }
+
+    if (remoteStream) {
+        remoteStream.getTracks().forEach(track => track.stop());
+        remoteStream = null;
+    }
+
+    updateStatus('disconnected', 'Disconnected');
+    connectBtn.style.display = 'block';
+    connectBtn.disabled = false;
+    disconnectBtn.style.display = 'none';
+}
+"""
 
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-    </style>
+# HTML UI for the bot; stylesheet and script URLs are filled in below
+HTML_UI = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Pipecat Voice Bot - Local Demo</title>
+    <link rel="stylesheet" href="{css_url}">
+    <script src="{js_url}" defer></script>
 </head>
 <body>
     <div class="container">
@@ -236,125 +421,167 @@ HTML_UI = """
 
     <audio id="remoteAudio" autoplay></audio>
 
-    <script>
-        let peerConnection = null;
-        let localStream = null;
-        let remoteStream = null;
+</body>
+</html>
+"""
 
-        const connectBtn = document.getElementById('connectBtn');
-        const disconnectBtn = document.getElementById('disconnectBtn');
-        const statusDiv = document.getElementById('status');
-        const remoteAudio = document.getElementById('remoteAudio');
 
-        function updateStatus(status, message) {
-            statusDiv.className = `status ${status}`;
-            statusDiv.innerHTML = message;
-        }
+class StaticAsset(NamedTuple):
+    """A UI resource encoded, compressed and hashed once at import time"""
 
-        connectBtn.addEventListener('click', async () => {
-            try {
-                connectBtn.disabled = true;
-                updateStatus('connecting', '<span class="spinner"></span>Connecting...');
-
-                // Get user media
-                localStream = await navigator.mediaDevices.getUserMedia({
-                    audio: true,
-                    video: false
-                });
-
-                // Create peer connection
-                peerConnection = new RTCPeerConnection({
-                    iceServers: [
-                        { urls: 'stun:stun.l.google.com:19302' },
-                        { urls: 'stun:stun1.l.google.com:19302' }
-                    ]
-                });
-
-                // Add local tracks
-                localStream.getTracks().forEach(track => {
-                    peerConnection.addTrack(track, localStream);
-                });
-
-                // Handle remote tracks
-                remoteStream = new MediaStream();
-                peerConnection.ontrack = (event) => {
-                    event.streams[0].getTracks().forEach(track => {
-                        remoteStream.addTrack(track);
-                    });
-                    remoteAudio.srcObject = remoteStream;
-                };
-
-                // Handle connection state changes
-                peerConnection.onconnectionstatechange = () => {
-                    console.log('Connection state:', peerConnection.connectionState);
-                    if (peerConnection.connectionState === 'connected') {
-                        updateStatus('connected', '✓ Connected - Start speaking!');
-                        connectBtn.style.display = 'none';
-                        disconnectBtn.style.display = 'block';
-                    } else if (peerConnection.connectionState === 'disconnected' ||
-                               peerConnection.connectionState === 'failed') {
-                        disconnect();
-                    }
-                };
-
-                // Create offer
-                const offer = await peerConnection.createOffer({
-                    offerToReceiveAudio: true,
-                    offerToReceiveVideo: false
-                });
-                await peerConnection.setLocalDescription(offer);
-
-                // Send offer to server
-                const response = await fetch('/api/offer', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        sdp: offer.sdp,
-                        type: offer.type
-                    })
-                });
-
-                if (!response.ok) {
-                    throw new Error('Failed to connect to server');
-                }
+    body: bytes
+    gzipped: bytes
+    digest: str
+    media_type: str
+    headers: dict
+    gzip_headers: dict
 
-                const answer = await response.json();
-                await peerConnection.setRemoteDescription(new RTCSessionDescription(answer));
 
-            } catch (error) {
-                console.error('Connection error:', error);
-                updateStatus('disconnected', '✗ Connection failed: ' + error.message);
-                disconnect();
-            }
-        });
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return re.sub(r":\s+", ":", css).strip()
 
-        disconnectBtn.addEventListener('click', disconnect);
 
-        function disconnect() {
-            if (peerConnection) {
-                peerConnection.close();
-                peerConnection = null;
-            }
+def minify_js(js: str) -> str:
+    """Drop indentation, blank lines and whole-line comments from a script
 
-            if (localStream) {
-                localStream.getTracks().forEach(track => track.stop());
-                localStream = null;
-            }
+    Line breaks are kept so automatic semicolon insertion is unaffected.
+    """
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
 
-            if (remoteStream) {
-                remoteStream.getTracks().forEach(track => track.stop());
-                remoteStream = null;
-            }
 
-            updateStatus('disconnected', 'Disconnected');
-            connectBtn.style.display = 'block';
-            connectBtn.disabled = false;
-            disconnectBtn.style.display = 'none';
-        }
-    </script>
-</body>
-</html>
-"""
+def minify_html(html: str) -> str:
+    """Drop indentation and blank lines from an HTML document"""
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def build_static_asset(text: str, media_type: str, cache_control: str) -> StaticAsset:
+    """Encode, gzip and fingerprint a UI resource
+
+    The identity and gzip bodies are different representations, so each gets
+    its own strong ETag.
+    """
+    body = text.encode("utf-8")
+    gzipped = gzip.compress(body, compresslevel=9)
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    headers = {"ETag": f'"{digest}"', "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    gzip_headers = {**headers, "ETag": f'"{digest}-gz"', "Content-Encoding": "gzip"}
+    return StaticAsset(body, gzipped, digest, media_type, headers, gzip_headers)
+
+
+def serve_static_asset(request: Request, asset: StaticAsset) -> Response:
+    """Serve a prebuilt asset, answering 304 for cached copies"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        content, headers = asset.gzipped, asset.gzip_headers
+    else:
+        content, headers = asset.body, asset.headers
+
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=content, media_type=asset.media_type, headers=headers)
+
+
+# The UI never changes at runtime, so minify, compress and hash it once at import time.
+# Stylesheet and script URLs carry their content digest, so they can be cached as immutable.
+CSS_ASSET = build_static_asset(
+    minify_css(UI_CSS), "text/css", "public, max-age=86400, immutable"
+)
+JS_ASSET = build_static_asset(
+    minify_js(UI_JS), "text/javascript", "public, max-age=86400, immutable"
+)
+HTML_ASSET = build_static_asset(
+    minify_html(
+        HTML_UI.format(
+            css_url=f"/static/app.css?v={CSS_ASSET.digest}",
+            js_url=f"/static/app.js?v={JS_ASSET.digest}",
+        )
+    ),
+    "text/html",
+    "public, max-age=3600",
+)
+
+
+def env_flag(name: str) -> bool:
+    """Read a boolean environment variable, accepting 1/true/yes/on in any case"""
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def configure_logging(level: str) -> None:
+    """Replace loguru's default handler with a synchronous, uncolored stderr sink"""
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=level,
+        format=LOG_FORMAT,
+        enqueue=False,
+        colorize=False,
+        backtrace=False,
+        diagnose=False,
+    )
+
+
+def preload_vad() -> None:
+    """Load the Silero VAD model and run a warmup inference once per process"""
+    global _vad_template
+
+    if _vad_template is not None:
+        return
+
+    analyzer = SileroVADAnalyzer(params=VAD_PARAMS)
+    # Push one 512-sample window through the session so the first call skips warmup
+    analyzer._model(np.zeros(512, dtype=np.float32), 16000)
+    analyzer._model.reset_states()
+    _vad_template = analyzer
+    logger.info("Silero VAD model preloaded")
+
+
+def create_vad_analyzer() -> SileroVADAnalyzer:
+    """Create a per-call VAD analyzer that reuses the preloaded ONNX session
+
+    The model's streaming state and the single-thread executor that runs
+    inference are per-call, so concurrent calls don't queue behind each
+    other; only the inference session, which is safe to run concurrently,
+    is shared.
+    """
+    if _vad_template is None:
+        preload_vad()
+
+    analyzer = copy.copy(_vad_template)
+    analyzer._executor = ThreadPoolExecutor(max_workers=1)
+    analyzer._model = copy.copy(_vad_template._model)
+    analyzer._model.reset_states()
+    return analyzer
+
+
+def get_pipeline_runner() -> PipelineRunner:
+    """Return the process-wide pipeline runner, creating it on first use"""
+    global _pipeline_runner
+
+    if _pipeline_runner is None:
+        _pipeline_runner = PipelineRunner(handle_sigint=False)
+    return _pipeline_runner
+
+
+def create_llm() -> GeminiLiveLLMService:
+    """Create the Gemini Live service for a single call
+
+    Pipeline processors belong to exactly one pipeline and the Live session
+    is opened when the pipeline starts, so services are created per call
+    from the shared module-level settings rather than pooled.
+    """
+    return GeminiLiveLLMService(
+        model=GEMINI_MODEL,
+        api_key=GOOGLE_API_KEY,
+        voice_id=GEMINI_VOICE_ID,
+        system_instruction=SYSTEM_INSTRUCTION,
+        tools=GOOGLE_SEARCH_TOOL,  # Enable Google Search
+    )
 
 
 async def run_bot(webrtc_connection):
@@ -365,18 +592,12 @@ async def run_bot(webrtc_connection):
             params=TransportParams(
                 audio_in_enabled=True,
                 audio_out_enabled=True,
-                vad_analyzer=SileroVADAnalyzer(),
-                audio_out_10ms_chunks=2,
+                vad_analyzer=create_vad_analyzer(),
+                audio_out_10ms_chunks=1,
             ),
         )
 
-        llm = GeminiLiveLLMService(
-            model="models/gemini-2.5-flash-native-audio-preview-09-2025",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            voice_id="Enceladus",  # Aoede, Charon, Fenrir, Kore, Puck
-            system_instruction=SYSTEM_INSTRUCTION,
-            tools=GOOGLE_SEARCH_TOOL,  # Enable Google Search
-        )
+        llm = create_llm()
 
         context = OpenAILLMContext(
             [
@@ -401,8 +622,8 @@ async def run_bot(webrtc_connection):
         task = PipelineTask(
             pipeline,
             params=PipelineParams(
-                enable_metrics=True,
-                enable_usage_metrics=True,
+                enable_metrics=ENABLE_METRICS,
+                enable_usage_metrics=ENABLE_METRICS,
             ),
         )
 
@@ -416,19 +637,96 @@ async def run_bot(webrtc_connection):
             logger.info("Client disconnected from bot")
             await task.cancel()
 
-        runner = PipelineRunner(handle_sigint=False)
-        await runner.run(task)
+        await get_pipeline_runner().run(task)
 
     except Exception as e:
         logger.error(f"Error running bot: {e}")
         raise
 
 
+async def _bot_worker(queue: asyncio.Queue):
+    """Run queued connections one at a time until the workers are stopped"""
+    while not _stopping_bot_workers:
+        connection = await queue.get()
+        try:
+            if not _stopping_bot_workers:
+                await run_bot(connection)
+        except Exception:
+            # run_bot already logged the error; keep the worker alive
+            pass
+        finally:
+            release_bot_slot()
+            queue.task_done()
+
+
+def start_bot_workers() -> None:
+    """Create the bot queue and spawn MAX_CONCURRENT_CALLS workers"""
+    global _bot_queue, _stopping_bot_workers
+
+    _stopping_bot_workers = False
+    _bot_queue = asyncio.Queue(maxsize=MAX_CONCURRENT_CALLS)
+    for _ in range(MAX_CONCURRENT_CALLS):
+        _bot_workers.append(asyncio.create_task(_bot_worker(_bot_queue)))
+    logger.info(f"Started {MAX_CONCURRENT_CALLS} bot workers")
+
+
+async def stop_bot_workers() -> None:
+    """Stop all bot workers, cancelling any running pipelines, and wait for them
+
+    PipelineRunner.run() absorbs cancellation and returns normally, so
+    cancelling a busy worker alone would not stop it. Running pipelines are
+    cancelled through the runner and busy workers exit once their call ends.
+    """
+    global _stopping_bot_workers
+
+    _stopping_bot_workers = True
+    await get_pipeline_runner().cancel()
+    for worker in _bot_workers:
+        worker.cancel()
+    await asyncio.gather(*_bot_workers, return_exceptions=True)
+    _bot_workers.clear()
+
+
+def reserve_bot_slot() -> bool:
+    """Claim a bot worker for a new call
+
+    Returns:
+        bool: False if every worker is already busy or claimed
+    """
+    global _reserved_bot_slots
+
+    if _stopping_bot_workers or _reserved_bot_slots >= MAX_CONCURRENT_CALLS:
+        return False
+    _reserved_bot_slots += 1
+    return True
+
+
+def release_bot_slot() -> None:
+    """Give back a slot claimed with reserve_bot_slot()"""
+    global _reserved_bot_slots
+
+    _reserved_bot_slots -= 1
+
+
+def enqueue_bot(webrtc_connection) -> None:
+    """Hand a connection to the next free bot worker
+
+    The caller must hold a slot from reserve_bot_slot(); the worker releases
+    it once the call ends. Since slots are bounded by the number of workers,
+    a connection never waits behind a busy worker.
+    """
+    _bot_queue.put_nowait(webrtc_connection)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan"""
     logger.info("Starting Pipecat local demo server")
+    preload_vad()
+    get_pipeline_runner()
+    start_bot_workers()
     yield
+    await stop_bot_workers()
     logger.info("Shutting down Pipecat local demo server")
 
 
@@ -438,104 +736,134 @@ app = FastAPI(
     description="Local WebRTC voice bot demo",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve the HTML UI"""
-    return HTML_UI
+@app.get("/")
+async def root(request: Request):
+    """Serve the precompressed HTML UI"""
+    return serve_static_asset(request, HTML_ASSET)
+
+
+@app.get("/static/app.css")
+async def app_css(request: Request):
+    """Serve the minified UI stylesheet"""
+    return serve_static_asset(request, CSS_ASSET)
+
+
+@app.get("/static/app.js")
+async def app_js(request: Request):
+    """Serve the minified UI script"""
+    return serve_static_asset(request, JS_ASSET)
 
 
 @app.post("/api/offer")
-async def handle_offer(request: Request, background_tasks: BackgroundTasks):
+async def handle_offer(request: Request):
     """Handle WebRTC offer from client"""
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
         sdp = body.get("sdp")
         sdp_type = body.get("type")
 
         if not sdp or not sdp_type:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={"error": "Missing SDP or type in request"}
             )
 
         logger.debug("Received WebRTC offer from client")
 
-        # Create WebRTC connection with ICE servers
-        webrtc_connection = SmallWebRTCConnection(
-            ice_servers=[
-                "stun:stun.l.google.com:19302",
-                "stun:stun1.l.google.com:19302"
-            ]
-        )
+        # Shed load before setting up a peer connection no bot could serve
+        if not reserve_bot_slot():
+            logger.warning("All bot workers are busy, rejecting WebRTC offer")
+            return ORJSONResponse(
+                status_code=503,
+                content={"error": "Too many concurrent calls, try again later"}
+            )
+
+        try:
+            # Create WebRTC connection with ICE servers
+            webrtc_connection = SmallWebRTCConnection(ice_servers=ICE_SERVERS)
 
-        # Initialize the connection with the client's offer
-        await webrtc_connection.initialize(sdp=sdp, type=sdp_type)
+            # Initialize the connection with the client's offer
+            await webrtc_connection.initialize(sdp=sdp, type=sdp_type)
+        except Exception:
+            release_bot_slot()
+            raise
 
-        # Connect the peer connection
-        await webrtc_connection.connect()
+        # Hand the connection to a bot worker as soon as the local description
+        # is ready, so the pipeline warms up while the peer finishes ICE. The
+        # transport connects the peer itself and the bot greets the user from
+        # on_client_connected, so there is no need to await connect() here.
+        enqueue_bot(webrtc_connection)
 
         # Get the answer to send back to client
         answer = webrtc_connection.get_answer()
 
-        # Start the bot in background
-        background_tasks.add_task(run_bot, webrtc_connection)
+        logger.info(f"WebRTC offer answered (pc_id: {answer.get('pc_id')})")
 
-        logger.info(f"WebRTC connection established (pc_id: {answer.get('pc_id')})")
-
-        return JSONResponse(content=answer)
+        return ORJSONResponse(answer)
 
     except Exception as e:
         logger.error(f"Error handling WebRTC offer: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Pipecat Local Demo - Voice bot with web UI"
-    )
-    parser.add_argument(
-        "--host",
-        default="localhost",
-        help="Host to bind server to (default: localhost)"
-    )
-    parser.add_argument(
-        "--port",
-        type=int,
-        default=7860,
-        help="Port to bind server to (default: 7860)"
-    )
-    parser.add_argument(
-        "--verbose",
-        "-v",
-        action="store_true",
-        help="Enable verbose logging"
+    # Environment variables are the primary config source; CLI flags override them
+    args = argparse.Namespace(
+        host=os.getenv("HOST", "localhost"),
+        port=int(os.getenv("PORT", "7860")),
+        verbose=env_flag("VERBOSE"),
     )
-    args = parser.parse_args()
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(
+            description="Pipecat Local Demo - Voice bot with web UI"
+        )
+        parser.add_argument(
+            "--host",
+            default=args.host,
+            help="Host to bind server to (default: $HOST or localhost)"
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=args.port,
+            help="Port to bind server to (default: $PORT or 7860)"
+        )
+        parser.add_argument(
+            "--verbose",
+            "-v",
+            action="store_true",
+            default=args.verbose,
+            help="Enable verbose logging"
+        )
+        args = parser.parse_args()
 
     # Configure logging
-    logger.remove(0)
-    log_level = "DEBUG" if args.verbose else "INFO"
-    logger.add(sys.stderr, level=log_level)
+    configure_logging("DEBUG" if args.verbose else "INFO")
 
     # Check for required environment variables
-    if not os.getenv("GOOGLE_API_KEY"):
+    if not GOOGLE_API_KEY:
         logger.error("GOOGLE_API_KEY environment variable is required!")
         logger.info("Please set it in your .env file or export it:")
         logger.info("  export GOOGLE_API_KEY='your-api-key-here'")
         sys.exit(1)
 
-    logger.info("=" * 60)
-    logger.info("🎙️  Pipecat Local Demo Server")
-    logger.info("=" * 60)
-    logger.info(f"Server starting on http://{args.host}:{args.port}")
-    logger.info(f"Open your browser and navigate to: http://{args.host}:{args.port}")
-    logger.info("=" * 60)
+    # The banner is only useful to someone watching a terminal
+    if sys.stderr.isatty():
+        logger.info("=" * 60)
+        logger.info("🎙️  Pipecat Local Demo Server")
+        logger.info("=" * 60)
+        logger.info(f"Server starting on http://{args.host}:{args.port}")
+        logger.info(f"Open your browser and navigate to: http://{args.host}:{args.port}")
+        logger.info("=" * 60)
+    else:
+        logger.info(f"Server starting on http://{args.host}:{args.port}")
 
     # Run the server
     try:
@@ -543,6 +871,8 @@ if __name__ == "__main__":
             app,
             host=args.host,
             port=args.port,
+            loop="uvloop",
+            http="httptools",
             log_config=None,  # We're using loguru
         )
     except KeyboardInterrupt:
@@ -25,6 +25,8 @@ Environment Variables Required:
 
 Usage:
     python server.py --host 0.0.0.0 --port 8080 --verbose
+    # or configure through the environment
+    HOST=0.0.0.0 PORT=8080 VERBOSE=1 python server.py
 """
 
 import argparse
@@ -35,16 +37,35 @@ from contextlib import asynccontextmanager
 from typing import Optional
 
 import aiohttp
+import orjson
 import uvicorn
+import uvloop
 from dotenv import load_dotenv
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
-from pipecat.transports.whatsapp.api import WhatsAppWebhookRequest
+from pipecat.transports.whatsapp.api import (
+    WhatsAppApi,
+    WhatsAppConnectCallValue,
+    WhatsAppWebhookRequest,
+)
 from pipecat.transports.whatsapp.client import WhatsAppClient
+from pydantic import ValidationError
 
 # from bot import run_bot
-from bot_local import run_bot
+from bot_local import (
+    ICE_SERVERS,
+    configure_logging,
+    enqueue_bot,
+    env_flag,
+    get_pipeline_runner,
+    preload_vad,
+    release_bot_slot,
+    reserve_bot_slot,
+    start_bot_workers,
+    stop_bot_workers,
+)
 
 # Load environment variables first
 load_dotenv(override=True)
@@ -68,8 +89,16 @@ if not all([WHATSAPP_TOKEN, WHATSAPP_WEBHOOK_VERIFICATION_TOKEN, WHATSAPP_PHONE_
     ]
     raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
+# Outbound HTTP tuning for the WhatsApp Graph API session
+HTTP_CONNECTOR_LIMIT = 100
+HTTP_CONNECTOR_LIMIT_PER_HOST = 32
+HTTP_DNS_CACHE_TTL = 300
+HTTP_KEEPALIVE_TIMEOUT = 75
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=3, sock_read=10)
+
 # Global state
 whatsapp_client: Optional[WhatsAppClient] = None
+whatsapp_api: Optional[WhatsAppApi] = None
 shutdown_event = asyncio.Event()
 
 
@@ -83,12 +112,84 @@ def signal_handler() -> None:
     shutdown_event.set()
 
 
+def orjson_dumps(obj) -> str:
+    """Serialize outbound JSON payloads with orjson.
+
+    aiohttp expects ``json_serialize`` to return ``str``, while orjson
+    produces ``bytes``.
+    """
+    return orjson.dumps(obj).decode()
+
+
+def has_call_events(payload: dict) -> bool:
+    """Check whether a raw webhook payload carries any call events.
+
+    Status and message notifications are far more frequent than calls and
+    are not handled by the bot, so they can be acknowledged without running
+    full Pydantic validation.
+
+    Args:
+        payload: Decoded webhook JSON body
+
+    Returns:
+        bool: True if any entry change contains call events
+
+    Raises:
+        ValueError: If the entries or their changes are not JSON objects
+    """
+    entries = payload.get("entry") or []
+    if not isinstance(entries, list):
+        raise ValueError("'entry' must be a list")
+
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError("webhook entries must be objects")
+        changes = entry.get("changes") or []
+        if not isinstance(changes, list):
+            raise ValueError("'changes' must be a list")
+        for change in changes:
+            if not isinstance(change, dict):
+                raise ValueError("webhook changes must be objects")
+            value = change.get("value")
+            if isinstance(value, dict) and value.get("calls"):
+                return True
+    return False
+
+
+async def disconnect_after_error(connection: SmallWebRTCConnection) -> None:
+    """Attempt to cleanup a WebRTC connection whose bot could not be started.
+
+    Args:
+        connection: The WebRTC connection to disconnect
+    """
+    try:
+        await connection.disconnect()
+        logger.debug("Connection {} disconnected after error", connection.pc_id)
+    except Exception as disconnect_error:
+        logger.error(f"Failed to disconnect connection after error: {disconnect_error}")
+
+
+async def reject_call(call_id: str) -> None:
+    """Reject an incoming WhatsApp call before it is answered.
+
+    Args:
+        call_id: ID of the call from the connect event
+    """
+    try:
+        response = await whatsapp_api.reject_call_to_whatsapp(call_id)
+        if not response.get("success", False):
+            logger.error(f"Failed to reject call {call_id}: {response}")
+    except Exception as e:
+        logger.error(f"Failed to reject call {call_id}: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan and resources.
 
-    Sets up the WhatsApp client with an HTTP session on startup
-    and ensures proper cleanup on shutdown.
+    Preloads the VAD model, creates the shared pipeline runner, starts the
+    bot workers and sets up the WhatsApp client with a pooled, keep-alive
+    HTTP session on startup, and ensures proper cleanup on shutdown.
 
     Args:
         app: The FastAPI application instance
@@ -96,11 +197,35 @@ async def lifespan(app: FastAPI):
     Yields:
         None: Control back to the application during runtime
     """
-    global whatsapp_client
+    global whatsapp_client, whatsapp_api
+
+    # Load the VAD model and create the shared pipeline runner up front so
+    # the first call doesn't pay for them
+    preload_vad()
+    get_pipeline_runner()
+    start_bot_workers()
+
+    # Reuse TLS connections to the Graph API across webhook bursts
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_CONNECTOR_LIMIT,
+        limit_per_host=HTTP_CONNECTOR_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True,
+    )
 
     # Initialize WhatsApp client with persistent HTTP session
-    async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=HTTP_TIMEOUT, json_serialize=orjson_dumps
+    ) as session:
         whatsapp_client = WhatsAppClient(
+            whatsapp_token=WHATSAPP_TOKEN,
+            phone_number_id=WHATSAPP_PHONE_NUMBER_ID,
+            session=session,
+            ice_servers=ICE_SERVERS,
+        )
+        # Used directly to reject calls that no bot worker is free to take
+        whatsapp_api = WhatsAppApi(
             whatsapp_token=WHATSAPP_TOKEN, phone_number_id=WHATSAPP_PHONE_NUMBER_ID, session=session
         )
         logger.info("WhatsApp client initialized successfully")
@@ -112,6 +237,7 @@ async def lifespan(app: FastAPI):
             logger.info("Cleaning up WhatsApp client resources...")
             if whatsapp_client:
                 await whatsapp_client.terminate_all_calls()
+            await stop_bot_workers()
             logger.info("Cleanup completed")
 
 
@@ -121,6 +247,7 @@ app = FastAPI(
     description="Handles WhatsApp webhooks and manages WebRTC connections for bot communication",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -160,13 +287,13 @@ app = FastAPI(
 
 @app.get("/")
 async def verify_webhook(request: Request):
-    params = dict(request.query_params)
-    logger.debug(f"Webhook verification request received with params: {list(params.keys())}")
+    logger.debug("Webhook verification request received")
 
     # WhatsApp sends parameters with 'hub.' prefix
-    verify_token = params.get("hub.verify_token")
-    challenge = params.get("hub.challenge")
-    mode = params.get("hub.mode")
+    query_params = request.query_params
+    verify_token = query_params.get("hub.verify_token")
+    challenge = query_params.get("hub.challenge")
+    mode = query_params.get("hub.mode")
 
     if not all([verify_token, challenge, mode]):
         logger.warning("Webhook verification failed: Missing required webhook verification parameters")
@@ -186,7 +313,7 @@ async def verify_webhook(request: Request):
     summary="Handle WhatsApp webhook events",
     description="Processes incoming WhatsApp messages and call events",
 )
-async def whatsapp_webhook(body: WhatsAppWebhookRequest, background_tasks: BackgroundTasks):
+async def whatsapp_webhook(request: Request):
     """Handle incoming WhatsApp webhook events.
 
     Processes WhatsApp Business API webhook requests including:
@@ -194,12 +321,12 @@ async def whatsapp_webhook(body: WhatsAppWebhookRequest, background_tasks: Backg
     - Call requests and status updates
     - User interactions
 
-    For call events, establishes WebRTC connections and spawns bot instances
-    in the background to handle real-time communication.
+    For call events, establishes WebRTC connections and queues them for the
+    bot workers to handle real-time communication. Payloads without
+    call events are acknowledged without being validated into a model.
 
     Args:
-        body: Parsed WhatsApp webhook request body
-        background_tasks: FastAPI background tasks manager
+        request: FastAPI request object carrying the raw webhook body
 
     Returns:
         dict: Success response with processing status
@@ -207,41 +334,84 @@ async def whatsapp_webhook(body: WhatsAppWebhookRequest, background_tasks: Backg
     Raises:
         HTTPException:
             400 for invalid request format or object type
+            422 for call events that fail validation
             500 for internal processing errors
     """
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        logger.warning("Invalid webhook request: body is not valid JSON")
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+    if not isinstance(payload, dict):
+        logger.warning("Invalid webhook request: body is not a JSON object")
+        raise HTTPException(status_code=400, detail="Invalid request body")
+
     # Validate webhook object type
-    if body.object != "whatsapp_business_account":
-        logger.warning(f"Invalid webhook object type: {body.object}")
+    object_type = payload.get("object")
+    if object_type != "whatsapp_business_account":
+        logger.warning(f"Invalid webhook object type: {object_type}")
         raise HTTPException(status_code=400, detail="Invalid object type")
 
-    logger.info(f"Processing WhatsApp webhook: {body.dict()}")
+    # Only call events reach the bot; acknowledge everything else right away
+    try:
+        if not has_call_events(payload):
+            return {"status": "ok"}
+    except ValueError as ve:
+        logger.warning(f"Invalid webhook request format: {ve}")
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(ve)}")
+
+    try:
+        body = WhatsAppWebhookRequest.model_validate(payload)
+    except ValidationError as e:
+        logger.warning(f"Invalid webhook call event: {e}")
+        raise HTTPException(status_code=422, detail="Invalid call event")
+
+    logger.opt(lazy=True).debug("Processing WhatsApp webhook: {}", lambda: body.model_dump_json())
+
+    # The client accepts a call before handing over its connection, and an
+    # accepted call without a bot is just silence. Claim a bot worker first
+    # and reject the call through the WhatsApp API if none is free.
+    connect_call_ids = [
+        call.id
+        for entry in body.entry
+        for change in entry.changes
+        if isinstance(change.value, WhatsAppConnectCallValue)
+        for call in change.value.calls
+        if call.event == "connect"
+    ]
+    slot_reserved = bool(connect_call_ids) and reserve_bot_slot()
+    if connect_call_ids and not slot_reserved:
+        logger.warning(f"All bot workers are busy, rejecting calls: {connect_call_ids}")
+        await asyncio.gather(*(reject_call(call_id) for call_id in connect_call_ids))
+        return {"status": "success", "message": "Call rejected, all bots are busy"}
+
+    slot_used = False
 
     async def connection_callback(connection: SmallWebRTCConnection):
         """Handle new WebRTC connections from WhatsApp calls.
 
         Called when a WebRTC connection is established for a WhatsApp call.
-        Spawns a bot instance to handle the conversation.
+        Hands it to the bot worker reserved for this call.
 
         Args:
             connection: The established WebRTC connection
         """
+        nonlocal slot_used
+
         try:
             logger.info(f"Starting bot for WebRTC connection: {connection.pc_id}")
-            background_tasks.add_task(run_bot, connection)
-            logger.debug(f"Bot task queued successfully for connection: {connection.pc_id}")
+            enqueue_bot(connection)
+            slot_used = True
+            logger.debug("Bot task queued successfully for connection: {}", connection.pc_id)
         except Exception as e:
             logger.error(f"Failed to start bot for connection {connection.pc_id}: {e}")
-            # Attempt to cleanup the connection on error
-            try:
-                await connection.disconnect()
-                logger.debug(f"Connection {connection.pc_id} disconnected after error")
-            except Exception as disconnect_error:
-                logger.error(f"Failed to disconnect connection after error: {disconnect_error}")
+            await disconnect_after_error(connection)
 
     try:
         # Process the webhook request
         result = await whatsapp_client.handle_webhook_request(body, connection_callback)
-        logger.debug(f"Webhook processed successfully: {result}")
+        logger.opt(lazy=True).debug("Webhook processed: {}", lambda: result)
         return {"status": "success", "message": "Webhook processed successfully"}
 
     except ValueError as ve:
@@ -250,6 +420,10 @@ async def whatsapp_webhook(body: WhatsAppWebhookRequest, background_tasks: Backg
     except Exception as e:
         logger.error(f"Internal error processing webhook: {e}")
         raise HTTPException(status_code=500, detail="Internal server error processing webhook")
+    finally:
+        # Give the worker back if no connection was handed to it
+        if slot_reserved and not slot_used:
+            release_bot_slot()
 
 
 async def run_server_with_signal_handling(host: str, port: int) -> None:
@@ -272,6 +446,8 @@ async def run_server_with_signal_handling(host: str, port: int) -> None:
         app,
         host=host,
         port=port,
+        loop="uvloop",
+        http="httptools",
         log_config=None,
     )
     server = uvicorn.Server(config)
@@ -298,31 +474,45 @@ async def run_server_with_signal_handling(host: str, port: int) -> None:
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="WhatsApp WebRTC Bot Server - Handles WhatsApp webhooks and WebRTC connections"
+    # Environment variables are the primary config source; CLI flags override them
+    args = argparse.Namespace(
+        host=os.getenv("HOST", "localhost"),
+        port=int(os.getenv("PORT", "7860")),
+        verbose=int(env_flag("VERBOSE")),
     )
-    parser.add_argument(
-        "--host", default="localhost", help="Host for HTTP server (default: localhost)"
-    )
-    parser.add_argument(
-        "--port", type=int, default=7860, help="Port for HTTP server (default: 7860)"
-    )
-    parser.add_argument("--verbose", "-v", action="count")
-    args = parser.parse_args()
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(
+            description=(
+                "WhatsApp WebRTC Bot Server - Handles WhatsApp webhooks and WebRTC connections"
+            )
+        )
+        parser.add_argument(
+            "--host", default=args.host, help="Host for HTTP server (default: $HOST or localhost)"
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=args.port,
+            help="Port for HTTP server (default: $PORT or 7860)",
+        )
+        parser.add_argument("--verbose", "-v", action="count", default=args.verbose)
+        args = parser.parse_args()
 
-    logger.remove(0)
-    if args.verbose:
-        logger.add(sys.stderr, level="TRACE")
-    else:
-        logger.add(sys.stderr, level="DEBUG")
+    configure_logging("TRACE" if args.verbose else "DEBUG")
 
     # Validate configuration
     logger.info("Starting WhatsApp WebRTC Bot Server...")
-    logger.debug(f"Configuration: host={args.host}, port={args.port}, verbose={args.verbose}")
+    logger.opt(lazy=True).debug(
+        "Configuration: host={}, port={}, verbose={}",
+        lambda: args.host,
+        lambda: args.port,
+        lambda: args.verbose,
+    )
 
-    # Run the server
+    # Run the server on uvloop; the server is served from our own loop, so
+    # uvicorn's ``loop`` setting alone would not apply here
     try:
-        asyncio.run(run_server_with_signal_handling(args.host, args.port))
+        uvloop.run(run_server_with_signal_handling(args.host, args.port))
     except KeyboardInterrupt:
         logger.info("Server interrupted by user")
     except Exception as e: